@@ -1,14 +1,41 @@
+import math
+import sys
+from collections import defaultdict
+
+_MENU = """
+====================
+1. View Products
+2. Add New Product
+3. Add Item to Cart
+4. View Cart
+5. Update Quantity in Cart
+6. Remove Item from Cart
+7. Search Product
+8. Checkout (Dummy)
+9. Exit
+===================="""
+
+def format_rupees(paise):
+    return f"₹{paise // 100}.{paise % 100:02d}"
+
 # Product Class
 class Product:
+    __slots__ = ("_product_id", "_name", "_name_lower", "_price", "_quantity_available", "_details_cache")
+
     def __init__(self, product_id, name, price, quantity_available):
         if price < 0:
             raise ValueError("Price must be non-negative.")
+        if not math.isfinite(price):
+            raise ValueError("Price must be a finite number.")
         if quantity_available < 0:
             raise ValueError("Quantity must be non-negative.")
-        self._product_id = product_id
-        self._name = name
-        self._price = price
+        self._product_id = sys.intern(product_id)
+        self._name = sys.intern(name)
+        self._name_lower = name.lower()
+        # Prices are held as integer paise to avoid float rounding and formatting.
+        self._price = round(price * 100)
         self._quantity_available = quantity_available
+        self._details_cache = None
 
     @property
     def product_id(self):
@@ -18,8 +45,16 @@ class Product:
     def name(self):
         return self._name
 
+    @property
+    def name_lower(self):
+        return self._name_lower
+
     @property
     def price(self):
+        return self._price / 100
+
+    @property
+    def price_paise(self):
         return self._price
 
     @property
@@ -30,24 +65,37 @@ class Product:
     def quantity_available(self, value):
         if value >= 0:
             self._quantity_available = value
+            self._details_cache = None
 
     def decrease_quantity(self, amount):
         if amount <= self._quantity_available:
             self._quantity_available -= amount
+            self._details_cache = None
             return True
         return False
 
+    def _decrease_unchecked(self, amount):
+        self._quantity_available -= amount
+        self._details_cache = None
+
     def increase_quantity(self, amount):
         self._quantity_available += amount
+        self._details_cache = None
 
     def display_details(self):
-        return f"ID: {self._product_id}, Name: {self._name}, Price: ₹{self._price:.2f}, Stock: {self._quantity_available}"
+        if self._details_cache is None:
+            self._details_cache = f"ID: {self._product_id}, Name: {self._name}, Price: {format_rupees(self._price)}, Stock: {self._quantity_available}"
+        return self._details_cache
 
 # CartItem Class
 class CartItem:
+    __slots__ = ("_product", "_quantity", "_subtotal", "_str_cache")
+
     def __init__(self, product, quantity):
         self._product = product
         self._quantity = quantity
+        self._subtotal = product.price_paise * quantity
+        self._str_cache = None
 
     @property
     def product(self):
@@ -61,37 +109,81 @@ class CartItem:
     def quantity(self, value):
         if value >= 0:
             self._quantity = value
+            self._subtotal = self._product.price_paise * value
+            self._str_cache = None
 
     def calculate_subtotal(self):
-        return self._product.price * self._quantity
+        return self._subtotal / 100
+
+    def calculate_subtotal_paise(self):
+        return self._subtotal
 
     def __str__(self):
-        return f"{self._product.name} x {self._quantity} = ₹{self.calculate_subtotal():.2f}"
+        if self._str_cache is None:
+            self._str_cache = f"{self._product.name} x {self._quantity} = {format_rupees(self._subtotal)}"
+        return self._str_cache
 
 # ShoppingCart Class
 class ShoppingCart:
     def __init__(self):
         self._catalog = {}
         self._items = {}
+        self._positions = {}
+        self._trigram_index = defaultdict(set)
+        self._total = 0
+        self._dispatch = {
+            "1": self.display_products,
+            "2": self.add_new_product,
+            "3": self._cmd_add_to_cart,
+            "4": self.display_cart,
+            "5": self._cmd_update_quantity,
+            "6": self._cmd_remove_item,
+            "7": self._cmd_search,
+            "8": self._cmd_checkout,
+        }
+
+    def _index_product(self, product):
+        name_lower = product.name_lower
+        for gram in {name_lower[i:i + 3] for i in range(len(name_lower) - 2)}:
+            self._trigram_index[gram].add(product.product_id)
+
+    def _unindex_product(self, product):
+        name_lower = product.name_lower
+        for gram in {name_lower[i:i + 3] for i in range(len(name_lower) - 2)}:
+            pids = self._trigram_index.get(gram)
+            if pids is not None:
+                pids.discard(product.product_id)
+                if not pids:
+                    del self._trigram_index[gram]
 
     def display_products(self):
         if not self._catalog:
             print("No products available.")
             return
-        print("\nAvailable Products:")
-        for product in self._catalog.values():
-            print(product.display_details())
+        lines = ["\nAvailable Products:"]
+        lines.extend(p.display_details() for p in self._catalog.values())
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.write("\n")
 
     def input_positive_integer(self, prompt):
+        text = input(prompt).strip()
+        if not text:
+            print("Invalid input. Please enter a number.")
+            return None
+        digits = text[1:] if text[0] in "+-" else text
+        if not digits.isdecimal():
+            print("Invalid input. Please enter a number.")
+            return None
         try:
-            value = int(input(prompt))
-            if value <= 0:
-                print("Please enter a positive integer.")
-                return None
-            return value
+            value = int(text)
         except ValueError:
+            # int() still refuses strings past the interpreter's digit limit.
             print("Invalid input. Please enter a number.")
             return None
+        if value <= 0:
+            print("Please enter a positive integer.")
+            return None
+        return value
 
     def add_new_product(self):
         pid = input("Enter Product ID: ").strip()
@@ -105,69 +197,101 @@ class ShoppingCart:
         try:
             price = float(input("Enter Price: "))
             quantity = int(input("Enter Quantity: "))
-            if price < 0 or quantity < 0:
+            if price < 0 or quantity < 0 or not math.isfinite(price):
                 raise ValueError
         except ValueError:
             print("Invalid price or quantity.")
             return
         try:
-            self._catalog[pid] = Product(pid, name, price, quantity)
+            product = Product(pid, name, price, quantity)
+            if pid in self._catalog:
+                self._unindex_product(self._catalog[pid])
+            else:
+                self._positions[pid] = len(self._positions)
+            self._catalog[pid] = product
+            self._index_product(product)
             print("Product added successfully.")
         except ValueError as e:
             print(e)
 
     def add_item(self, product_id, quantity):
-        if product_id in self._catalog:
-            product = self._catalog[product_id]
-            if quantity > product.quantity_available:
-                print(f"Only {product.quantity_available} units available.")
+        product = self._catalog.get(product_id)
+        if product is not None:
+            avail = product._quantity_available
+            if quantity > avail:
+                print(f"Only {avail} units available.")
                 return False
-            if product.decrease_quantity(quantity):
-                if product_id in self._items:
-                    self._items[product_id].quantity += quantity
-                else:
-                    self._items[product_id] = CartItem(product, quantity)
-                print("Item added to cart.")
-                return True
+            product._decrease_unchecked(quantity)
+            item = self._items.get(product_id)
+            if item is not None:
+                before = item.calculate_subtotal_paise()
+                item.quantity += quantity
+                self._total += item.calculate_subtotal_paise() - before
+            else:
+                item = self._items[product_id] = CartItem(product, quantity)
+                self._total += item.calculate_subtotal_paise()
+            print("Item added to cart.")
+            return True
         print("Invalid product ID or insufficient stock.")
         return False
 
-    def remove_item(self, product_id):
-        if product_id in self._items:
-            confirm = input(f"Are you sure you want to remove {product_id}? (y/n): ").strip().lower()
-            if confirm != 'y':
-                print("Cancelled.")
-                return False
-            item = self._items.pop(product_id)
+    def _pop_item(self, product_id):
+        item = self._items.pop(product_id, None)
+        if item is not None:
             item.product.increase_quantity(item.quantity)
+            self._total -= item.calculate_subtotal_paise()
+        return item
+
+    def remove_item(self, product_id):
+        if self._pop_item(product_id) is not None:
             print("Item removed from cart.")
             return True
         print("Item not found in cart.")
         return False
 
+    def bulk_remove(self, product_ids):
+        removed = [pid for pid in product_ids if self._pop_item(pid) is not None]
+        print(f"{len(removed)} item(s) removed from cart.")
+        return removed
+
     def update_quantity(self, product_id, new_quantity):
-        if product_id in self._items:
-            item = self._items[product_id]
-            diff = new_quantity - item.quantity
+        item = self._items.get(product_id)
+        if item is not None:
+            if new_quantity < 0:
+                print("Quantity must be non-negative.")
+                return False
+            product = item._product
+            diff = new_quantity - item._quantity
+            avail = product._quantity_available
+            if diff > avail:
+                print(f"Only {avail} additional items available.")
+                return False
             if diff > 0:
-                if item.product.quantity_available >= diff:
-                    item.product.decrease_quantity(diff)
-                    item.quantity = new_quantity
-                    print("Quantity updated.")
-                    return True
-                else:
-                    print(f"Only {item.product.quantity_available} additional items available.")
-                    return False
+                product._decrease_unchecked(diff)
             else:
-                item.product.increase_quantity(-diff)
-                item.quantity = new_quantity
-                print("Quantity updated.")
-                return True
+                product.increase_quantity(-diff)
+            before = item.calculate_subtotal_paise()
+            item.quantity = new_quantity
+            self._total += item.calculate_subtotal_paise() - before
+            print("Quantity updated.")
+            return True
         print("Item not found in cart.")
         return False
 
     def search_product_by_name(self, keyword):
-        matches = [p for p in self._catalog.values() if keyword.lower() in p.name.lower()]
+        keyword = keyword.lower()
+        if len(keyword) < 3:
+            candidates = self._catalog.values()
+        else:
+            grams = {keyword[i:i + 3] for i in range(len(keyword) - 2)}
+            postings = [self._trigram_index.get(g, set()) for g in grams]
+            pids = set.intersection(*postings)
+            if not pids:
+                print("No matching products found.")
+                return
+            ordered = sorted(pids, key=self._positions.__getitem__)
+            candidates = [self._catalog[pid] for pid in ordered]
+        matches = [p for p in candidates if keyword in p.name_lower]
         if not matches:
             print("No matching products found.")
         else:
@@ -179,57 +303,61 @@ class ShoppingCart:
         if not self._items:
             print("Cart is empty.")
             return
-        print("\nYour Cart:")
-        total = 0
-        for item in self._items.values():
-            print(item)
-            total += item.calculate_subtotal()
-        print(f"Grand Total: ₹{total:.2f}")
+        lines = ["\nYour Cart:"]
+        lines.extend(str(item) for item in self._items.values())
+        lines.append(f"Grand Total: {format_rupees(self._total)}")
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.write("\n")
+
+    def get_total(self):
+        return self._total / 100
+
+    def get_total_paise(self):
+        return self._total
+
+    def _cmd_add_to_cart(self):
+        pid = input("Enter Product ID: ").strip()
+        qty = self.input_positive_integer("Enter Quantity: ")
+        if qty is not None:
+            self.add_item(pid, qty)
+
+    def _cmd_update_quantity(self):
+        pid = input("Enter Product ID: ").strip()
+        qty = self.input_positive_integer("Enter New Quantity: ")
+        if qty is not None:
+            self.update_quantity(pid, qty)
+
+    def _cmd_remove_item(self):
+        pid = input("Enter Product ID to Remove: ").strip()
+        if pid not in self._items:
+            print("Item not found in cart.")
+            return
+        confirm = input(f"Are you sure you want to remove {pid}? (y/n): ").strip().lower()
+        if confirm != 'y':
+            print("Cancelled.")
+            return
+        self.remove_item(pid)
+
+    def _cmd_search(self):
+        keyword = input("Enter keyword to search product name: ")
+        self.search_product_by_name(keyword)
+
+    def _cmd_checkout(self):
+        self.display_cart()
+        print("Thank you for shopping with us! (Simulated Checkout)")
+        self._items.clear()
+        self._total = 0
 
     def run(self):
         while True:
-            print("""
-====================
-1. View Products
-2. Add New Product
-3. Add Item to Cart
-4. View Cart
-5. Update Quantity in Cart
-6. Remove Item from Cart
-7. Search Product
-8. Checkout (Dummy)
-9. Exit
-====================""")
+            print(_MENU)
             choice = input("Enter choice: ").strip()
-            if choice == "1":
-                self.display_products()
-            elif choice == "2":
-                self.add_new_product()
-            elif choice == "3":
-                pid = input("Enter Product ID: ").strip()
-                qty = self.input_positive_integer("Enter Quantity: ")
-                if qty is not None:
-                    self.add_item(pid, qty)
-            elif choice == "4":
-                self.display_cart()
-            elif choice == "5":
-                pid = input("Enter Product ID: ").strip()
-                qty = self.input_positive_integer("Enter New Quantity: ")
-                if qty is not None:
-                    self.update_quantity(pid, qty)
-            elif choice == "6":
-                pid = input("Enter Product ID to Remove: ").strip()
-                self.remove_item(pid)
-            elif choice == "7":
-                keyword = input("Enter keyword to search product name: ")
-                self.search_product_by_name(keyword)
-            elif choice == "8":
-                self.display_cart()
-                print("Thank you for shopping with us! (Simulated Checkout)")
-                self._items.clear()
-            elif choice == "9":
+            if choice == "9":
                 print("Exiting... Goodbye!")
                 break
+            handler = self._dispatch.get(choice)
+            if handler:
+                handler()
             else:
                 print("Invalid choice. Please select between 1-9.")
 